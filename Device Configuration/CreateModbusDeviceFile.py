@@ -29,13 +29,13 @@ Usage:
     python CreateModbusDeviceFile.py EPMS_System_6A.xlsx out.py     # explicit output path
 
 Then open the generated .py and paste its contents into the Ignition
-script console.  Requires: pandas, openpyxl.
+script console.  Requires: openpyxl.
 """
 
 import os
 import argparse
 
-import pandas as pd
+from openpyxl import load_workbook
 
 DEFAULT_DEVICE_TYPE = "ModbusTcp"
 DEFAULT_PORT = 502
@@ -116,16 +116,29 @@ print "----------------------------------------"
 print "%d processed, %d total in file" % (len(results), len(devices))
 '''
 
+# Placeholder text read as an empty cell, so a deviceName/hostname of e.g. 'N/A'
+# skips the row instead of creating a device.
+NA_STRINGS = frozenset((
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+    "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a",
+    "nan", "null",
+))
+
+
+def _blank(v):
+    """True for empty cells and NA_STRINGS text."""
+    return v is None or (isinstance(v, str) and v in NA_STRINGS)
+
 
 def _clean(v):
-    """Trimmed string, or '' for blanks/NaN."""
-    if v is None or (isinstance(v, float) and pd.isna(v)):
+    """Trimmed string, or '' for blank/NA cells."""
+    if _blank(v):
         return ""
     return str(v).strip()
 
 
 def _to_int(v, default):
-    if v is None or (isinstance(v, float) and pd.isna(v)):
+    if _blank(v):
         return default
     try:
         return int(float(v))
@@ -135,7 +148,7 @@ def _to_int(v, default):
 
 def _to_int_opt(v):
     """Integer, or None if blank/invalid (so the device default is used)."""
-    if v is None or (isinstance(v, float) and pd.isna(v)):
+    if _blank(v):
         return None
     try:
         return int(float(v))
@@ -145,7 +158,7 @@ def _to_int_opt(v):
 
 def _to_bool_opt(v):
     """True/False from common spreadsheet values, or None if blank/unclear."""
-    if v is None or (isinstance(v, float) and pd.isna(v)):
+    if _blank(v):
         return None
     if isinstance(v, bool):
         return v
@@ -159,19 +172,31 @@ def _to_bool_opt(v):
 
 def load_devices(path):
     """Return (devices, warnings). Validates names/hostnames/ports."""
-    df = pd.read_excel(path)
-    df.columns = [str(c).strip() for c in df.columns]
-
-    missing = {"deviceName", "hostname"} - set(df.columns)
+    # read-only mode skips styles and the cell DOM; device lists are small,
+    # so the raw row values are simply collected before closing the file
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[0]
+        ws.reset_dimensions()   # a stale <dimension> would silently drop rows
+        # error cells (#N/A, #REF!, ...) are blank too, for the same reason
+        rows = [tuple(None if c.data_type == "e" else c.value for c in r)
+                for r in ws.iter_rows()]
+    finally:
+        wb.close()
+    columns = [str(c).strip() if c is not None else "" for c in (rows[0] if rows else ())]
+
+    missing = {"deviceName", "hostname"} - set(columns)
     if missing:
         raise SystemExit(
             "ERROR: missing required column(s): %s\n       Found columns: %s"
-            % (", ".join(sorted(missing)), ", ".join(df.columns)))
+            % (", ".join(sorted(missing)), ", ".join(c for c in columns if c)))
+    # optional props whose column is on the sheet, resolved once for all rows
+    present_props = [p for p in OPTIONAL_PROPS if p[0] in columns]
 
     devices, warnings, seen = [], [], {}
     # start=2 so the number lines up with the Excel row (row 1 = header)
-    for excel_row, row in enumerate(df.itertuples(index=False), start=2):
-        rec = row._asdict()
+    for excel_row, values in enumerate(rows[1:], start=2):
+        rec = dict(zip(columns, values))
         name = _clean(rec.get("deviceName"))
         if not name:
             continue  # skip fully blank rows silently
@@ -193,9 +218,7 @@ def load_devices(path):
         seen[name] = excel_row
         props = {"hostname": host, "port": port}
         # add any optional Modbus props that are present and filled in
-        for col, key, kind in OPTIONAL_PROPS:
-            if col not in df.columns:
-                continue
+        for col, key, kind in present_props:
             val = _to_bool_opt(rec.get(col)) if kind == "bool" else _to_int_opt(rec.get(col))
             if val is not None:
                 props[key] = val
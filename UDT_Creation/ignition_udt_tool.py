@@ -22,16 +22,17 @@ Usage
   # (Backwards compatible) build straight from an old flat sheet:
   python ignition_udt_tool.py build STD_DI.xlsx STD_DI.json --udt-name STD_DI
 
-Requires: pandas, openpyxl
+Requires: openpyxl  (orjson optional -- faster JSON when installed)
 """
 
 import os
 import re
 import sys
+import math
 import json
 import argparse
+from pathlib import Path
 
-import pandas as pd
 from openpyxl import Workbook, load_workbook
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.worksheet.datavalidation import DataValidation
@@ -39,6 +40,11 @@ from openpyxl.utils import get_column_letter
 from openpyxl.workbook.defined_name import DefinedName
 from openpyxl.comments import Comment
 
+try:
+    import orjson
+except ImportError:     # optional; fall back to the stdlib json module
+    orjson = None
+
 
 # ---------------------------------------------------------------------------
 # Allowable values defined by Inductive Automation (Ignition 8.1 tag JSON).
@@ -104,6 +110,7 @@ TAG_COLUMNS = [
     ("historicalDeadbandStyle",  "Auto | Analog_Compressed | Discrete. Dropdown."),
     ("historicalDeadbandMode",   "Absolute | Percent | Off. Dropdown."),
 ]
+TAG_FIELDS = frozenset(h for h, _ in TAG_COLUMNS)
 
 # Any of the value columns below accept THREE forms:
 #   * a literal            -> 528   |  High  |  TRUE
@@ -455,8 +462,9 @@ def _write_tag_row(ws, tag_col, row, tag):
     put("tagGroup", tag.get("tagGroup"))
     put("deadband", tag.get("deadband"))
     put("deadbandMode", tag.get("deadbandMode"))
-    if tag.get("historyEnabled") is not None:
-        put("historyEnabled", "TRUE" if tag["historyEnabled"] else "FALSE")
+    hist = tag.get("historyEnabled")
+    if hist is not None:
+        put("historyEnabled", "TRUE" if hist else "FALSE")
     put("historyProvider", tag.get("historyProvider"))
     put("sampleMode", tag.get("sampleMode"))
     put("historySampleRate", tag.get("historySampleRate"))
@@ -484,17 +492,31 @@ def _write_alarm_row(ws, al_col, row, tagname, al):
         put("enabled", _unbind(en))
     elif en is not None:
         put("enabled", "TRUE" if en else "FALSE")
-    if al.get("ackNotesReqd") is not None:
-        put("ackNotesReqd", "TRUE" if al["ackNotesReqd"] else "FALSE")
+    ackn = al.get("ackNotesReqd")
+    if ackn is not None:
+        put("ackNotesReqd", "TRUE" if ackn else "FALSE")
     put("timeOnDelaySeconds", al.get("timeOnDelaySeconds"))
     put("timeOffDelaySeconds", al.get("timeOffDelaySeconds"))
     put("displayPath", _unbind(al.get("displayPath")))
 
 
+def _read_json(path):
+    """Parse a UTF-8 JSON file (orjson when available).
+
+    The file is read in one go and decoded by the parser itself, rather than
+    streamed through a text-mode decoder."""
+    raw = Path(path).read_bytes()
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass    # e.g. NaN/Infinity, which older builds wrote; json accepts them
+    return json.loads(raw)
+
+
 def import_json(json_file, output_file):
     """Read an Ignition UDT JSON and write it back into a fillable template."""
-    with open(json_file, encoding="utf-8") as f:
-        data = json.load(f)
+    data = _read_json(json_file)
 
     wb, R = _new_workbook_skeleton()
     ws_udt, ws_tags, ws_al, ws_st = R["ws_udt"], R["ws_tags"], R["ws_al"], R["ws_st"]
@@ -520,19 +542,23 @@ def import_json(json_file, output_file):
     n_alarms = n_states = 0
     unmapped = set()
     known = set(tag_col) | {"Metadata", "alarms", "opcItemPath", "opcServer"}
-    for tag in data.get("tags", []):
+    c_tag, c_label, c_value = st_col["tagName"], st_col["label"], st_col["value"]
+    tags = data.get("tags", [])
+    for tag in tags:
         _write_tag_row(ws_tags, tag_col, trow, tag)
         trow += 1
         name = tag.get("name", "")
-        unmapped |= {k for k in tag if k not in known}
-        for al in (tag.get("alarms") or []):
+        alarms = tag.get("alarms")
+        states = (tag.get("Metadata") or {}).get("states")
+        unmapped.update(tag.keys() - known)
+        for al in (alarms or []):
             _write_alarm_row(ws_al, al_col, arow, name, al)
             arow += 1
             n_alarms += 1
-        for st in ((tag.get("Metadata") or {}).get("states") or []):
-            ws_st.cell(row=srow, column=st_col["tagName"], value=name)
-            ws_st.cell(row=srow, column=st_col["label"], value=st.get("label", ""))
-            ws_st.cell(row=srow, column=st_col["value"], value=_state_cell(st.get("value")))
+        for st in (states or []):
+            ws_st.cell(row=srow, column=c_tag, value=name)
+            ws_st.cell(row=srow, column=c_label, value=st.get("label", ""))
+            ws_st.cell(row=srow, column=c_value, value=_state_cell(st.get("value")))
             srow += 1
             n_states += 1
 
@@ -540,7 +566,7 @@ def import_json(json_file, output_file):
     print(f"[OK] Imported {json_file}")
     print(f"     -> {output_file}")
     print(f"     UDT Name : {data.get('name', '')}")
-    print(f"     Tags     : {len(data.get('tags', []))}")
+    print(f"     Tags     : {len(tags)}")
     if n_alarms:
         print(f"     Alarms   : {n_alarms}")
     if n_states:
@@ -553,60 +579,131 @@ def import_json(json_file, output_file):
 # ===========================================================================
 # BUILD (workbook -> Ignition UDT JSON)
 # ===========================================================================
+# spreadsheet text that counts as TRUE (set lookup instead of a tuple scan)
+_TRUE_STRINGS = frozenset(("true", "1", "yes", "y"))
+
+# Placeholder text read as an empty cell on the Tags/Alarms/States sheets, so
+# e.g. an engUnit of 'n/a' is left out of the tag rather than exported.
+_NA_STRINGS = frozenset((
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+    "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a",
+    "nan", "null",
+))
+
+
 def _s(v):
     """Clean string or None."""
-    if v is None or (isinstance(v, float) and pd.isna(v)):
+    if v is None:
         return None
     s = str(v).strip()
     return s if s else None
 
 
+def _sym(v):
+    """Like _s, but interned: for enum-like fields (dataType, units, ...) that
+    repeat on every row, so all tags share one string object per value."""
+    s = _s(v)
+    return sys.intern(s) if s is not None and len(s) < 32 else s
+
+
 def _num(v, as_int=False):
-    if v is None or (isinstance(v, float) and pd.isna(v)):
+    """Number, or None if blank/invalid. NaN/inf count as invalid: they are not
+    legal JSON and json/orjson would write them differently."""
+    if v is None:
         return None
     try:
-        return int(round(float(v))) if as_int else float(v)
+        f = float(v)
     except (ValueError, TypeError):
         return None
+    if not math.isfinite(f):
+        return None
+    return int(round(f)) if as_int else f
 
 
 def _bool(v):
-    if v is None or (isinstance(v, float) and pd.isna(v)):
+    if v is None:
         return None
     if isinstance(v, bool):
         return v
-    return str(v).strip().lower() in ("true", "1", "yes", "y")
+    return str(v).strip().lower() in _TRUE_STRINGS
+
 
+def _cell_value(cell):
+    """Cell value, or None for blank, error and _NA_STRINGS cells."""
+    v = cell.value
+    if cell.data_type == "e" or (isinstance(v, str) and v in _NA_STRINGS):
+        return None
+    return v
 
-def _read_udt_sheet(path):
+
+def _sheet_rows(ws, fields=None):
+    """Read a sheet's header (row 1) and return (columns, rows).
+
+    `columns` is the set of headers kept: those in `fields`, or all when None.
+    `rows` streams the remaining rows as {header: value} dicts. Blank cells are
+    left out, so row.get(col) is None for both a missing column and an empty
+    cell, and fully blank rows are skipped. Excel error cells (#N/A, #REF!, ...)
+    and _NA_STRINGS count as blank. Works on read-only worksheets, so nothing
+    is held in memory beyond the current row."""
+    # the stored <dimension> can be stale; without this, rows/columns past it
+    # are silently dropped
+    ws.reset_dimensions()
+    rows = ws.iter_rows()
+    keep = []
+    for i, c in enumerate(next(rows, ())):
+        h = str(c.value).strip() if c.value is not None else ""
+        if h and (fields is None or h in fields):
+            keep.append((i, h))
+    return {h for _, h in keep}, _records(rows, keep)
+
+
+def _records(rows, keep):
+    """Yield the non-blank `keep` cells of each row as a dict; skip blank rows."""
+    for cells in rows:
+        n = len(cells)
+        row = {}
+        for i, h in keep:
+            if i < n:
+                v = _cell_value(cells[i])
+                if v is not None:
+                    row[h] = v
+        if row:
+            yield row
+
+
+def _read_udt_sheet(wb):
     """Return (udt_name, parent, default_group, type_color, parameters_dict)."""
-    try:
-        wb = load_workbook(path, data_only=True)
-    except Exception:
-        return None, None, None, None, {}
     if "UDT" not in wb.sheetnames:
         return None, None, None, None, {}
     ws = wb["UDT"]
-    name = _s(ws["B3"].value)
-    parent = _s(ws["B4"].value)
-    default_group = _s(ws["B5"].value)
-    type_color = _num(ws["B6"].value, as_int=True)
+    ws.reset_dimensions()
+    # read-only sheets have no cheap random access, so grab the A:C block once
+    grid = list(ws.iter_rows(max_col=3, values_only=True))
+
+    def cell(r, c):
+        row = grid[r - 1] if r <= len(grid) else ()
+        return row[c - 1] if c <= len(row) else None
+
+    name = _s(cell(3, 2))
+    parent = _s(cell(4, 2))
+    default_group = _s(cell(5, 2))
+    type_color = _num(cell(6, 2), as_int=True)
     params = {}
     type_map = {"string": "String", "integer": "Integer", "int": "Integer",
                 "float": "Float", "boolean": "Boolean"}
     r = 9
     while True:
-        pname = _s(ws.cell(row=r, column=1).value)
+        pname = _s(cell(r, 1))
         if not pname:
-            if r > 9 and not _s(ws.cell(row=r + 1, column=1).value):
+            if r > 9 and not _s(cell(r + 1, 1)):
                 break
             if r > 200:
                 break
             r += 1
             continue
-        ptype_raw = (_s(ws.cell(row=r, column=2).value) or "String")
+        ptype_raw = (_s(cell(r, 2)) or "String")
         ptype = type_map.get(ptype_raw.lower(), "String")
-        pval = ws.cell(row=r, column=3).value
+        pval = cell(r, 3)
         if ptype == "Integer":
             pval = _num(pval, as_int=True)
         elif ptype == "Float":
@@ -647,7 +744,7 @@ def _alarm_value(v, kind="str"):
       * 'expr:<text>' or {braces} -> {"bindType": "Expression",   "value": "<text>"}
       * anything else             -> literal (num / bool / str per `kind`)
     """
-    if v is None or (isinstance(v, float) and pd.isna(v)):
+    if v is None:
         return None
     if isinstance(v, bool):
         return v
@@ -663,11 +760,12 @@ def _alarm_value(v, kind="str"):
             return {"bindType": "Expression", "value": s}
         if kind == "num":
             try:
-                return float(s)
+                f = float(s)
             except ValueError:
                 return s
+            return f if math.isfinite(f) else s
         if kind == "bool":
-            return s.lower() in ("true", "1", "yes", "y")
+            return s.lower() in _TRUE_STRINGS
         return s
     # non-string literal (number from Excel)
     if kind == "bool":
@@ -680,28 +778,30 @@ def _alarm_value(v, kind="str"):
 
 def _coerce_state_value(v):
     """States keep their type: TRUE/FALSE -> bool, whole number -> int, else text."""
-    if v is None or (isinstance(v, float) and pd.isna(v)):
+    if v is None:
         return None
     if isinstance(v, bool):
         return v
     s = str(v).strip()
-    if s.lower() in ("true", "false"):
-        return s.lower() == "true"
+    low = s.lower()
+    if low == "true" or low == "false":
+        return low == "true"
     try:
         f = float(s)
-        return int(f) if f.is_integer() else f
     except ValueError:
         return s
+    if not math.isfinite(f):
+        return s
+    return int(f) if f.is_integer() else f
 
 
-def _read_states(path):
+def _read_states(wb):
     """Return dict: tagName -> [ {label, value}, ... ]  for Metadata.states."""
     states_by_tag = {}
-    try:
-        df = pd.read_excel(path, sheet_name="States")
-    except Exception:
+    if "States" not in wb.sheetnames:
         return states_by_tag
-    for _, row in df.iterrows():
+    _, rows = _sheet_rows(wb["States"])
+    for row in rows:
         tag = _s(row.get("tagName"))
         label = _s(row.get("label"))
         if not tag or label is None:
@@ -711,20 +811,19 @@ def _read_states(path):
     return states_by_tag
 
 
-def _read_alarms(path):
+def _read_alarms(wb):
     """Return dict: tagName -> [alarm dicts]."""
     alarms_by_tag = {}
-    try:
-        df = pd.read_excel(path, sheet_name="Alarms")
-    except Exception:
+    if "Alarms" not in wb.sheetnames:
         return alarms_by_tag
-    for _, row in df.iterrows():
+    _, rows = _sheet_rows(wb["Alarms"])
+    for row in rows:
         tag = _s(row.get("tagName"))
         aname = _s(row.get("alarmName"))
         if not tag or not aname:
             continue
         alarm = {"name": aname}
-        mode = _s(row.get("mode"))
+        mode = _sym(row.get("mode"))
         if mode:
             alarm["mode"] = mode
         # value columns that accept literal / {Param} / expr: bindings
@@ -748,10 +847,59 @@ def _read_alarms(path):
     return alarms_by_tag
 
 
-def _build_tag(row, alarms_by_tag, states_by_tag, default_group):
+def _int(v):
+    return _num(v, as_int=True)
+
+
+# Plain optional tag fields -> (column/JSON key, cleaner, group), emitted only
+# when the cell has a value. The group sets where in the tag the field lands:
+#   doc      -> before name/tagType
+#   eng      -> before tagGroup
+#   deadband -> after tagGroup
+#   history  -> only when historyEnabled is TRUE
+TAG_OPTIONAL_FIELDS = [
+    ("documentation", _s, "doc"),
+    ("tooltip", _s, "doc"),
+    ("engUnit", _sym, "eng"),
+    ("engLow", _num, "eng"),
+    ("engHigh", _num, "eng"),
+    ("formatString", _s, "eng"),
+    ("deadband", _num, "deadband"),
+    ("deadbandMode", _sym, "deadband"),
+    ("historyProvider", _sym, "history"),
+    ("sampleMode", _sym, "history"),
+    ("historySampleRate", _int, "history"),
+    ("historySampleRateUnits", _sym, "history"),
+    ("historicalDeadband", _num, "history"),
+    ("historicalDeadbandStyle", _sym, "history"),
+    ("historicalDeadbandMode", _sym, "history"),
+]
+
+
+def _tag_fields(columns=None):
+    """TAG_OPTIONAL_FIELDS as {group: [(col, cleaner), ...]}, narrowed to the
+    columns a sheet actually has (all when None), so _build_tag never tries
+    a field that cannot be there."""
+    groups = {"doc": [], "eng": [], "deadband": [], "history": []}
+    for col, clean, group in TAG_OPTIONAL_FIELDS:
+        if columns is None or col in columns:
+            groups[group].append((col, clean))
+    return groups
+
+
+def _put_fields(tag, row, fields):
+    for col, clean in fields:
+        v = clean(row.get(col))
+        if v is not None:
+            tag[col] = v
+
+
+def _build_tag(row, alarms_by_tag, states_by_tag, default_group, fields=None):
     name = _s(row.get("name"))
     if not name:
         return None
+    if fields is None:
+        fields = _tag_fields()
     tag = {}
 
     # Metadata custom property -- emitted on EVERY tag.
@@ -763,7 +911,7 @@ def _build_tag(row, alarms_by_tag, states_by_tag, default_group):
         metadata["states"] = states_by_tag[name]
     tag["Metadata"] = metadata
 
-    value_source = _s(row.get("valueSource")) or "memory"
+    value_source = _sym(row.get("valueSource")) or "memory"
     tag["valueSource"] = value_source
 
     # source-specific fields
@@ -779,66 +927,26 @@ def _build_tag(row, alarms_by_tag, states_by_tag, default_group):
         if expr:
             tag["expression"] = expr
 
-    tag["dataType"] = _s(row.get("dataType")) or "Boolean"
+    tag["dataType"] = _sym(row.get("dataType")) or "Boolean"
 
-    doc = _s(row.get("documentation"))
-    if doc:
-        tag["documentation"] = doc
-    tip = _s(row.get("tooltip"))
-    if tip:
-        tag["tooltip"] = tip
+    _put_fields(tag, row, fields["doc"])
 
     tag["name"] = name
-    tag["tagType"] = _s(row.get("tagType")) or "AtomicTag"
+    tag["tagType"] = _sym(row.get("tagType")) or "AtomicTag"
 
-    eng_unit = _s(row.get("engUnit"))
-    if eng_unit:
-        tag["engUnit"] = eng_unit
-    for jkey, col in [("engLow", "engLow"), ("engHigh", "engHigh")]:
-        v = _num(row.get(col))
-        if v is not None:
-            tag[jkey] = v
-    fmt = _s(row.get("formatString"))
-    if fmt:
-        tag["formatString"] = fmt
+    _put_fields(tag, row, fields["eng"])
 
-    group = _s(row.get("tagGroup")) or default_group
+    group = _sym(row.get("tagGroup")) or default_group
     if group:
         tag["tagGroup"] = group
 
-    # value deadband
-    db = _num(row.get("deadband"))
-    if db is not None:
-        tag["deadband"] = db
-    dbm = _s(row.get("deadbandMode"))
-    if dbm:
-        tag["deadbandMode"] = dbm
+    _put_fields(tag, row, fields["deadband"])
 
     # history
     hist = _bool(row.get("historyEnabled"))
     if hist:
         tag["historyEnabled"] = True
-        prov = _s(row.get("historyProvider"))
-        if prov:
-            tag["historyProvider"] = prov
-        sm = _s(row.get("sampleMode"))
-        if sm:
-            tag["sampleMode"] = sm
-        rate = _num(row.get("historySampleRate"), as_int=True)
-        if rate is not None:
-            tag["historySampleRate"] = rate
-        units = _s(row.get("historySampleRateUnits"))
-        if units:
-            tag["historySampleRateUnits"] = units
-        hdb = _num(row.get("historicalDeadband"))
-        if hdb is not None:
-            tag["historicalDeadband"] = hdb
-        hstyle = _s(row.get("historicalDeadbandStyle"))
-        if hstyle:
-            tag["historicalDeadbandStyle"] = hstyle
-        hmode = _s(row.get("historicalDeadbandMode"))
-        if hmode:
-            tag["historicalDeadbandMode"] = hmode
+        _put_fields(tag, row, fields["history"])
 
     # alarms attached from the Alarms sheet
     if name in alarms_by_tag:
@@ -847,29 +955,72 @@ def _build_tag(row, alarms_by_tag, states_by_tag, default_group):
     return tag
 
 
-def build(input_file, output_file, udt_name_arg=None):
-    # UDT-level info + parameters
-    udt_name, parent, default_group, type_color, params = _read_udt_sheet(input_file)
-    udt_name = udt_name_arg or udt_name
-
-    # pick the tag sheet: prefer 'Tags', else first sheet (old flat format)
-    xl = pd.ExcelFile(input_file)
-    tag_sheet = "Tags" if "Tags" in xl.sheet_names else xl.sheet_names[0]
-    df = pd.read_excel(input_file, sheet_name=tag_sheet).dropna(how="all")
-
-    if not udt_name:
-        udt_name = "UntitledUDT"
-        print("[WARN] No UDT name found. Set it on the 'UDT' sheet or pass "
-              "--udt-name. Using 'UntitledUDT'.")
+def _dumps(obj):
+    """2-space indented UTF-8 JSON bytes (orjson when available)."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+        except TypeError:   # JSONEncodeError, e.g. an int beyond 64 bits
+            pass
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _write_json(path, data):
+    """Write a top-level dict as 2-space indented JSON.
+
+    List values (the UDT 'tags') are serialized one item at a time, so only a
+    single tag is ever held as JSON text instead of the whole document. With
+    the stdlib backend the bytes match json.dump(data, f, indent=2,
+    ensure_ascii=False); orjson spells some floats differently (1e16 vs
+    1e+16) but parses to the same values. The cleaners never emit NaN/inf, so
+    both backends always write valid JSON."""
+    with open(path, "wb") as f:
+        if not data:
+            f.write(b"{}")
+            return
+        for n, (key, value) in enumerate(data.items()):
+            f.write(b"{\n  " if n == 0 else b",\n  ")
+            f.write(_dumps(key) + b": ")
+            if isinstance(value, list) and value:
+                for i, item in enumerate(value):
+                    f.write(b"[\n    " if i == 0 else b",\n    ")
+                    # raw newlines only occur between tokens, never in strings
+                    f.write(_dumps(item).replace(b"\n", b"\n    "))
+                f.write(b"\n  ]")
+            else:
+                f.write(_dumps(value).replace(b"\n", b"\n  "))
+        f.write(b"\n}")
 
-    alarms_by_tag = _read_alarms(input_file)
-    states_by_tag = _read_states(input_file)
 
-    tags = []
-    for _, row in df.iterrows():
-        tag = _build_tag(row, alarms_by_tag, states_by_tag, default_group)
-        if tag:
-            tags.append(tag)
+def build(input_file, output_file, udt_name_arg=None):
+    # read-only: rows are streamed from the xlsx instead of loading the full DOM
+    wb = load_workbook(input_file, read_only=True, data_only=True)
+    try:
+        # UDT-level info + parameters
+        udt_name, parent, default_group, type_color, params = _read_udt_sheet(wb)
+        udt_name = udt_name_arg or udt_name
+
+        if not udt_name:
+            udt_name = "UntitledUDT"
+            print("[WARN] No UDT name found. Set it on the 'UDT' sheet or pass "
+                  "--udt-name. Using 'UntitledUDT'.")
+
+        alarms_by_tag = _read_alarms(wb)
+        states_by_tag = _read_states(wb)
+
+        # pick the tag sheet: prefer 'Tags', else first sheet (old flat format)
+        tag_sheet = "Tags" if "Tags" in wb.sheetnames else wb.sheetnames[0]
+        columns, rows = _sheet_rows(wb[tag_sheet], TAG_FIELDS)
+        # specialize the per-row field lists to the columns this sheet has
+        fields = _tag_fields(columns)
+        tags = []
+        for row in rows:
+            tag = _build_tag(row, alarms_by_tag, states_by_tag, default_group,
+                             fields)
+            if tag:
+                tags.append(tag)
+    finally:
+        wb.close()
 
     result = {"name": udt_name, "tagType": "UdtType"}
     if parent:
@@ -884,8 +1035,7 @@ def build(input_file, output_file, udt_name_arg=None):
     out_dir = os.path.dirname(os.path.abspath(output_file))
     os.makedirs(out_dir, exist_ok=True)
 
-    with open(output_file, "w", encoding="utf-8") as f:
-        json.dump(result, f, indent=2, ensure_ascii=False)
+    _write_json(output_file, result)
 
     print(f"[OK] Wrote {output_file}")
     print(f"     UDT Name : {udt_name}")